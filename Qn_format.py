@@ -25,29 +25,102 @@ no information is lost.
 
 '''
 
+import numpy as np
+
 def float_to_fixed_point(number, n, is_signed = True):
-    if number < 0 and is_signed == False:
-        raise "Negative numbers are always signed"
-    # Calculate the sign bit
-    num_sign_bits = 1 if (number < 0 or (number >= 0 and is_signed)) else 0
+    if number < 0 and not is_signed:
+        raise ValueError("Negative numbers are always signed")
+    # Calculate the sign bit, negative numbers have already been checked to be signed
+    num_sign_bits = int(is_signed)
     
     # Calculate the absolute value of the number
     abs_number = abs(number)
     
-    # Calculate the integer part and fractional part
-    integer_part = int(abs_number)
-    
-    # Calculate the number of bits for the integer part
-    num_integer_bits = 0
-    while integer_part > 0:
-        num_integer_bits += 1
-        integer_part //= 2
+    # Calculate the number of bits for the integer part, i = ceil(log2(|x| + 1))
+    num_integer_bits = int(abs_number).bit_length()
     
     # Calculate the number of bits for the fractional part
     num_fraction_bits = n - num_sign_bits - num_integer_bits
     
     # Return the fixed-point representation as {sign, num_integer_bits, num_fraction_bits}
-    return "{" + str(num_sign_bits) + ", " + str(num_integer_bits) + ", " + str(num_fraction_bits) + "}"
+    return f"{{{num_sign_bits}, {num_integer_bits}, {num_fraction_bits}}}"
+
+def float_to_fixed_point_batch(arr, n, is_signed = True):
+    """
+    Vectorized float_to_fixed_point over a NumPy array.
+    Returns the (sign, integer, fraction) bit counts as three integer arrays.
+    """
+    arr = np.asarray(arr)
+    negative = arr < 0
+    if not is_signed and negative.any():
+        raise ValueError("Negative numbers are always signed")
+    # Calculate the sign bits
+    num_sign_bits = (negative | is_signed).astype(np.int64)
+    
+    # Calculate the integer part of the absolute values
+    integer_part = np.floor(np.abs(arr))
+    
+    # Calculate the number of bits for the integer part: the binary exponent from frexp
+    # (k = m * 2^e with 0.5 <= m < 1) is exactly k.bit_length(), with no log2 rounding
+    num_integer_bits = np.frexp(integer_part)[1].astype(np.int64)
+    
+    # Calculate the number of bits for the fractional part
+    num_fraction_bits = n - num_sign_bits - num_integer_bits
+    
+    return num_sign_bits, num_integer_bits, num_fraction_bits
+
+def _storage_dtype(num_bits, is_signed = True):
+    """
+    Smallest NumPy integer type holding a num_bits wide fixed-point word.
+    Words are capped at 32 bits so quantize_qn's bounds stay exact in float64.
+    """
+    for width in (8, 16, 32):
+        if num_bits <= width:
+            return np.dtype(("int" if is_signed else "uint") + str(width))
+    raise ValueError("Fixed-point word wider than 32 bits")
+
+def calibrate_qn(x, n, is_signed = True):
+    """
+    Per-tensor Qn calibration: the integer bits needed for the largest magnitude
+    in x, with the left over bits going to the fraction.
+    """
+    ib = int(np.max(np.abs(x))).bit_length()
+    fb = n - int(is_signed) - ib
+    return ib, fb
+
+def quantize_qn(x, ib, fb, is_signed = True):
+    """
+    Quantize x to Qn values with ib integer and fb fraction bits (plus the sign bit if signed):
+    y = clamp(round(x * 2^fb), lo, hi). A negative fb stores x scaled down by 2^-fb.
+    """
+    dtype = _storage_dtype(int(is_signed) + ib + fb, is_signed)
+    bound = 1 << (ib + fb)
+    lo = -bound if is_signed else 0
+    # Round half up without branches: keep one extra fraction bit, then add it back after the shift,
+    # y = (M >> 1) + (M & 1) with M = floor(x * 2^(fb+1)). M is computed in float64, where the bounds of
+    # a word of up to 32 bits are exact, and clamped to [2*lo, 2*(bound-1)] before the int64 cast, so
+    # huge values and infinities saturate instead of overflowing; NaN carries no magnitude and quantizes to 0
+    m = np.floor(np.ldexp(np.asarray(x, np.float64), fb + 1))
+    m = np.nan_to_num(np.clip(m, 2 * lo, 2 * (bound - 1)), nan=0.0).astype(np.int64)
+    y = np.clip((m >> 1) + (m & 1), lo, bound - 1)
+    return y.astype(dtype)
+
+def quantize(x, n, is_signed = True):
+    """
+    Quantize x to n bit Qn values using one {sign, integer, fraction} allocation for the tensor.
+    Returns the packed integers (int8/uint8 for Q8) with ib and fb; q.view(np.uint8) gives raw storage.
+    """
+    x = np.asarray(x)
+    if not is_signed and (x < 0).any():
+        raise ValueError("Negative numbers are always signed")
+    ib, fb = calibrate_qn(x, n, is_signed)
+    return quantize_qn(x, ib, fb, is_signed), ib, fb
+
+def dequantize_qn(y, fb):
+    """
+    Inverse of quantize_qn: x = y * 2^-fb.
+    """
+    return y.astype(np.float32) * np.float32(2.0 ** -fb)
 
 
 if __name__ == "__main__":
@@ -72,3 +145,16 @@ if __name__ == "__main__":
     number = 250.45
     fixed_point_representation = float_to_fixed_point(number, n, is_signed=False)
     print(f"Fixed-point representation of {number} (unsigned) in Q{n} format:", fixed_point_representation)
+
+    weights = np.array([-3.4, 3.4, 1.2, -0.01], dtype=np.float32)
+    ib, fb = calibrate_qn(weights, n)
+    quantized = quantize_qn(weights, ib, fb)
+    print(f"Quantized {weights} in Q{n} format {{1, {ib}, {fb}}}:", quantized)
+    print("Dequantized back:", dequantize_qn(quantized, fb))
+
+    weights = np.array([250.45, 3.4, 0.7], dtype=np.float32)
+    quantized, ib, fb = quantize(weights, n, is_signed=False)
+    print(f"Quantized {weights} (unsigned) in Q{n} format {{0, {ib}, {fb}}}:", quantized)
+    quantized, ib, fb = quantize(weights, n, is_signed=True)
+    print(f"Quantized {weights} (signed) in Q{n} format {{1, {ib}, {fb}}}:", quantized,
+          "->", dequantize_qn(quantized, fb))
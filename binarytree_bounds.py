@@ -1,6 +1,8 @@
 from typing import List, Optional, Tuple
 
 class TreeNode:
+    __slots__ = ('val', 'left', 'right')
+
     def __init__(self, val=0, left=None, right=None):
         self.val = val
         self.left = left
@@ -10,18 +12,22 @@ def dfs(node: Optional[TreeNode]) -> Tuple[int, int]:
     """
     Perform DFS to find the minimum and maximum values in the subtree rooted at node.
     """
-    if not node:
-        # float('inf') should be used to represent the smallest possible value when looking for the minimum.
-        # float('-inf') should be used to represent the largest possible value when looking for the maximum.
-        # This means that if the node is None (i.e., when a subtree does not exist), it should contribute an 
-        # "infinite minimum" and a "negative infinite maximum" to ensure correct comparisons in the tree traversal.
-        return float('inf'), float('-inf')
-    # Recursion on left and right subtrees
-    left_min, left_max = dfs(node.left)
-    right_min, right_max = dfs(node.right)
-    # Find min and max values for the current subtree
-    min_val = min(node.val, left_min, right_min)
-    max_val = max(node.val, left_max, right_max)
+    # An empty tree yields the sentinels (inf, -inf), which find_min_max maps to -1
+    min_val, max_val = float('inf'), float('-inf')
+    # Only the extrema over all nodes are needed, so a single top-down traversal with an
+    # explicit stack replaces the recursion (no frame per node, no recursion limit on skewed trees)
+    stack = [node] if node else []
+    while stack:
+        node = stack.pop()
+        val = node.val
+        if val < min_val:
+            min_val = val
+        if val > max_val:
+            max_val = val
+        if node.left:
+            stack.append(node.left)
+        if node.right:
+            stack.append(node.right)
     return min_val, max_val
 
 def find_min_max(root: Optional[TreeNode]) -> List[int]:
@@ -45,19 +51,18 @@ def build_complete_binary_tree(values: List[int]) -> Optional[TreeNode]:
     Construct a complete binary tree from a list of values.
     `-1` represents a missing node.
     """
-    if not values:
-        return None
-    nodes = [None if val == -1 else TreeNode(val) for val in values]
-    root = nodes[0]
-    for i in range(len(values)):
-        if nodes[i] is not None:
+    n = len(values)
+    nodes = [None] * n
+    # Build bottom-up in a single pass: the children at 2i+1 and 2i+2 already exist
+    # when node i is created, so they are passed straight to the constructor
+    for i in range(n - 1, -1, -1):
+        if values[i] != -1:
             left_index = 2 * i + 1
             right_index = 2 * i + 2
-            if left_index < len(values):
-                nodes[i].left = nodes[left_index]
-            if right_index < len(values):
-                nodes[i].right = nodes[right_index]
-    return root
+            nodes[i] = TreeNode(values[i],
+                                nodes[left_index] if left_index < n else None,
+                                nodes[right_index] if right_index < n else None)
+    return nodes[0] if nodes else None
 
 # Example usage:
 # Constructing a complete binary tree from a list:
@@ -1,28 +1,29 @@
 import re
 
+LOWER = "abcdefghijklmnopqrstuvwxyz"
+UPPER = LOWER.upper()
+WORD = re.compile(r'[a-zA-Z]+')
+NON_ALPHA = re.compile(r'[^a-zA-Z]')
+# One translation table per shift value, built once; str.translate then maps every character in C
+SHIFT_TABLES = [str.maketrans(LOWER + UPPER, LOWER[s:] + LOWER[:s] + UPPER[s:] + UPPER[:s]) for s in range(26)]
+
 def find_shift(known_word: str, word_in_original: str) -> int:
+    if len(known_word) != len(word_in_original):
+        return None
     shift = (ord(known_word[0]) - ord(word_in_original[0])) % 26
-    for i in range(1, len(known_word)):
-        if (ord(known_word[i]) - ord(word_in_original[i])) % 26 != shift:
-            return None
+    # The first letter fixes the only candidate shift; checking it is a single C-level translate and compare
+    if word_in_original.translate(SHIFT_TABLES[shift]) != known_word:
+        return None
     return shift
 
 def apply_shift(sentence: str, shift: int) -> str:
-    shifted_sentence = []
-    for char in sentence:
-        if char.isalpha():
-            base = ord('a') if char.islower() else ord('A')
-            shifted_char = chr(((ord(char) - base + shift) % 26) + base)
-            shifted_sentence.append(shifted_char)
-        else:
-            shifted_sentence.append(char)
-    return ''.join(shifted_sentence)
+    return sentence.translate(SHIFT_TABLES[shift % 26])
 
 def clean_sentence(sentence: str) -> str:
-    return re.sub(r'[^a-zA-Z]', '', sentence)
+    return NON_ALPHA.sub('', sentence)
 
 def deciphered_sentence(original_sentence: str, known_word: str) -> str:
-    words = re.findall(r'[a-zA-Z]+', original_sentence)
+    words = WORD.findall(original_sentence)
     for word in words:
         if len(word) == len(known_word):
             shift = find_shift(known_word, clean_sentence(word))
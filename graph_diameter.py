@@ -8,51 +8,155 @@
     is called the diameter of the graph.
 '''
 
-from collections import deque, defaultdict
+from array import array
 
-def build_graph(edges):
-    graph = defaultdict(list)
-    for u, v in edges:
-        graph[u].append(v)
-        graph[v].append(u)
-    return graph
+import numpy as np
 
-def bfs(start_node, graph):
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Below this many nodes the pure Python BFS is used, as the JIT dispatch overhead dominates
+JIT_MIN_NODES = 1_000
+
+def build_csr(edges):
+    """
+    Relabel the nodes to 0..n-1 and pack the undirected adjacency in CSR form:
+    the neighbors of node i are indices[indptr[i]:indptr[i + 1]]. Also returns the original labels.
+    """
+    # Relabel in order of first appearance; any hashable node works, including tuples
+    index = {}
+    ids = np.array([(index.setdefault(u, len(index)), index.setdefault(v, len(index))) for u, v in edges],
+                   dtype=np.int32).reshape(-1, 2)
+    labels = list(index)
+    # Every undirected edge is stored in both directions, grouped by source node
+    src = np.concatenate([ids[:, 0], ids[:, 1]])
+    dst = np.concatenate([ids[:, 1], ids[:, 0]])
+    indices = dst[np.argsort(src, kind='stable')]
+    indptr = np.zeros(len(labels) + 1, np.int32)
+    np.cumsum(np.bincount(src, minlength=len(labels)), out=indptr[1:])
+    return indptr, indices, labels
+
+def bfs(start_node, indptr, indices, distances):
     """
     Perform BFS from start_node and return the farthest node and its distance from start_node.
+    distances is overwritten with the distance of every node from start_node (-1 if unreachable).
     """
-    distances = {node: -1 for node in graph}
+    distances[:] = array('i', [-1]) * len(distances)
     distances[start_node] = 0
-    queue = deque([start_node])
+    # Iterating over the queue picks up the nodes appended to it, so no popleft is needed
+    queue = [start_node]
     farthest_node = start_node
     max_distance = 0
-    while queue:
-        node = queue.popleft()
-        current_distance = distances[node]
-        for neighbor in graph[node]:
+    for node in queue:
+        next_distance = distances[node] + 1
+        for neighbor in indices[indptr[node]:indptr[node + 1]]:
             if distances[neighbor] == -1:  # Unvisited
-                distances[neighbor] = current_distance + 1
+                distances[neighbor] = next_distance
                 queue.append(neighbor)
-                if distances[neighbor] > max_distance:
-                    max_distance = distances[neighbor]
+                if next_distance > max_distance:
+                    max_distance = next_distance
                     farthest_node = neighbor
     return farthest_node, max_distance
 
+if njit is not None:
+    @njit(cache=True)
+    def bfs_jit(start_node, indptr, indices, distances):
+        """
+        Compiled equivalent of bfs, with a preallocated array as the queue.
+        """
+        n = len(distances)
+        for i in range(n):
+            distances[i] = -1
+        queue = np.empty(n, np.int32)
+        head = 0
+        tail = 1
+        queue[0] = start_node
+        distances[start_node] = 0
+        farthest_node = start_node
+        max_distance = 0
+        while head < tail:
+            node = queue[head]
+            head += 1
+            next_distance = distances[node] + 1
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[k]
+                if distances[neighbor] == -1:  # Unvisited
+                    distances[neighbor] = next_distance
+                    queue[tail] = neighbor
+                    tail += 1
+                    if next_distance > max_distance:
+                        max_distance = next_distance
+                        farthest_node = neighbor
+        return farthest_node, max_distance
+
+def ifub(indptr, indices, center, lower_bound=0, search=bfs):
+    """
+    Exact diameter of the component containing center with iFUB (iterative Fringe Upper Bound).
+    Nodes are visited by decreasing BFS level i from center; the eccentricity of any node below
+    level i is at most 2 * (i - 1), so the search stops once the lower bound reaches that bound.
+    """
+    n = len(indptr) - 1
+    distances = array('i', [-1]) * n
+    _, level = search(center, indptr, indices, distances)
+    fringes = [[] for _ in range(level + 1)]
+    for node, distance in enumerate(distances):
+        if distance != -1:
+            fringes[distance].append(node)
+    scratch = array('i', [-1]) * n
+    lower_bound = max(lower_bound, level)
+    while 2 * level > lower_bound:
+        for node in fringes[level]:
+            _, eccentricity = search(node, indptr, indices, scratch)
+            lower_bound = max(lower_bound, eccentricity)
+        if lower_bound > 2 * (level - 1):
+            break
+        level -= 1
+    return lower_bound
+
 def longest_shortest_path(edges):
     """
     Find the diameter of the graph defined by the edges.
     """
-    # Build the graph
-    graph = build_graph(edges)
+    # Build the graph relabeled to integer nodes in CSR form
+    indptr, indices, labels = build_csr(edges)
+    n = len(labels)
+    distances = array('i', [-1]) * n
+    # Use the compiled BFS when numba is available and the graph is large enough to amortize it,
+    # otherwise plain lists are the fastest to index from the Python BFS
+    if njit is not None and n >= JIT_MIN_NODES:
+        search = bfs_jit
+    else:
+        search = bfs
+        indptr, indices = indptr.tolist(), indices.tolist()
     # arbitrary starting node (e.g., the first node in the graph)
-    start_node = next(iter(graph))
+    start_node = 0
     # Perform BFS from the start node to find the farthest node
-    farthest_node, _ = bfs(start_node, graph)
+    farthest_node, _ = search(start_node, indptr, indices, distances)
     # Perform BFS from the farthest node found to determine the diameter
-    _, diameter = bfs(farthest_node, graph)
+    other_end, diameter = search(farthest_node, indptr, indices, distances)
     # two-pass BFS technique: Graphy theory insight, by performing BFS from an arbitrary node we identify 
     # a node that is farthest from the start, and this node is always one end of the longest shortest path.
-    return diameter
+    # That holds for trees, so a component with one edge fewer than it has nodes is answered right away.
+    component_nodes = 0
+    component_degree = 0
+    for node in range(n):
+        if distances[node] != -1:
+            component_nodes += 1
+            component_degree += indptr[node + 1] - indptr[node]
+    if component_degree // 2 == component_nodes - 1:
+        return diameter
+    # On general graphs the two-pass result is only a lower bound, which iFUB refines to the exact
+    # diameter starting from the middle of the path found, a central node with low eccentricity.
+    # iFUB runs one BFS per node of every fringe level it has to check, so when the outermost level
+    # holds O(n) nodes (e.g. dense peripheries) this costs O(n * (n + m)).
+    back_distances = array('i', [-1]) * n
+    search(other_end, indptr, indices, back_distances)
+    half = diameter // 2
+    center = next(node for node in range(n)
+                  if back_distances[node] == half and distances[node] == diameter - half)
+    return ifub(indptr, indices, center, diameter, search)
 
 edges = [(1, 2), (1, 3), (2, 4), (3, 5), (4, 6), (5, 6)]
 print(f"The diameter of the graph is: {longest_shortest_path(edges)}")
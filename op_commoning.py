@@ -1,3 +1,5 @@
+import sys
+
 class Call:
     def __init__(self, op):
         self._op = op
@@ -11,33 +13,54 @@ class Call:
         if done is None:
             done = {}
 
-        if self not in done:
-            args = []
-            for n in self._operand:
-                args.append(n.print_graph(done))
-            done[self] = len(done) + 1
-            print(f"%{done[self]} = {self._op}({','.join([str(item) for item in args])})")
+        # Iterative post-order: a call is numbered and emitted once all of its operands are
+        lines = []
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                if node not in done:
+                    done[node] = len(done) + 1
+                    args = ','.join(map(str, (done[n] for n in node._operand)))
+                    lines.append(f"%{done[node]} = {node._op}({args})")
+            elif node not in done:
+                stack.append((node, True))
+                for n in reversed(node._operand):
+                    if n not in done:
+                        stack.append((n, False))
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
         return done[self]
 
 def op_commoning(call):
-    call_map = {}
-    _collect_calls(call, call_map)
-    return _reconstruct(call, call_map)
-
-def _collect_calls(call, call_map):
-    if call._op in call_map:
-        call_map[call._op].append(call)
-    else:
-        call_map[call._op] = [call]
-    for operand in call._operand:
-        _collect_calls(operand, call_map)
-
-def _reconstruct(call, call_map):
-    if call._op in call_map and len(call_map[call._op]) > 1:
-        return call_map[call._op][0]
-    else:
-        operands = [_reconstruct(operand, call_map) for operand in call._operand]
-        return Call(call._op)(*operands)
+    # Hash-consing: a call is keyed by its op and its already commoned operands,
+    # so structurally identical subexpressions map to one shared call
+    unique = {}
+    commoned = {}
+    for node in _post_order(call):
+        operands = [commoned[operand] for operand in node._operand]
+        key = (node._op, tuple(map(id, operands)))
+        if key not in unique:
+            unique[key] = Call(node._op)(*operands)
+        commoned[node] = unique[key]
+    return commoned[call]
+
+def _post_order(call):
+    # Iterative DFS over the DAG: every call appears once, after all of its operands
+    order = []
+    visited = set()
+    stack = [(call, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+        elif node not in visited:
+            visited.add(node)
+            stack.append((node, True))
+            for operand in reversed(node._operand):
+                if operand not in visited:
+                    stack.append((operand, False))
+    return order
 
 if __name__ == "__main__":
     input_call = Call("I")